@@ -0,0 +1,54 @@
+# cython: language_level=3
+"""Native corpus depletion recurrence used by app.withdrawal_to_corpus_duration"""
+import numpy as np
+cimport cython
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def simulate_depletion(double starting_corpus, double monthly_withdrawal, double monthly_return,
+                       double monthly_inflation, int max_months=1200):
+    """
+    Month-by-month depletion recurrence, same contract as the numba version in app.py
+    Returns one row per month of starting balance, monthly return, withdrawal and ending balance
+    """
+    result = np.empty((max_months + 1, 4))
+    cdef double[:, ::1] schedule = result
+
+    cdef double one_plus_g = 1.0 + monthly_inflation
+    cdef double current_corpus = starting_corpus
+    cdef double current_withdrawal = monthly_withdrawal
+    cdef double monthly_ret, corpus_after_return, actual_withdrawal
+    cdef Py_ssize_t month = 0
+
+    with nogil:
+        while current_corpus > 0:
+            schedule[month, 0] = current_corpus
+
+            # Apply return to corpus
+            monthly_ret = current_corpus * monthly_return
+            corpus_after_return = current_corpus + monthly_ret
+
+            # Check if withdrawal exceeds remaining corpus
+            actual_withdrawal = min(current_withdrawal, corpus_after_return)
+
+            # Subtract withdrawal
+            current_corpus = corpus_after_return - actual_withdrawal
+
+            schedule[month, 1] = monthly_ret
+            schedule[month, 2] = actual_withdrawal
+            schedule[month, 3] = max(0.0, current_corpus)
+            month += 1
+
+            # If corpus is depleted, break
+            if current_corpus <= 0:
+                break
+
+            # Increase withdrawal for next month due to inflation
+            current_withdrawal *= one_plus_g
+
+            # Safety check to prevent infinite loop
+            if month > max_months:
+                break
+
+    return result[:month]
@@ -1,10 +1,10 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from io import StringIO
-import math
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from numba import njit
+import csv
 
 # Set page configuration
 st.set_page_config(
@@ -39,6 +39,9 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# pd.eval (numexpr) only beats plain NumPy on long schedules
+NUMEXPR_MIN_ROWS = 10000
+
 def convert_annual_to_monthly_rate(annual_rate):
     """Convert annual percentage rate to monthly rate"""
     return (1 + annual_rate / 100) ** (1/12) - 1
@@ -52,6 +55,79 @@ def format_currency(amount):
     else:
         return f"₹{amount:,.0f}"
 
+def format_currency_vec(amounts):
+    """Format an array of amounts like format_currency, picking the Cr/L scale with np.digitize"""
+    amounts = np.asarray(amounts, dtype=np.float64)
+    bucket = np.digitize(amounts, [100000, 10000000])
+    scaled = amounts / np.array([1, 100000, 10000000])[bucket]
+    units = np.array(['', 'L', 'Cr'])[bucket]
+    return np.array([f"₹{v:.2f} {u}" if u else f"₹{v:,.0f}" for v, u in zip(scaled, units)])
+
+def show_currency_table(df, currency_cols):
+    """Show a month-by-month table with the given columns formatted as rupees"""
+    if hasattr(st, "column_config"):
+        # Format in the grid itself, keeping the numeric dtypes
+        st.dataframe(
+            df,
+            use_container_width=True,
+            column_config={col: st.column_config.NumberColumn(format="₹%d") for col in currency_cols}
+        )
+    else:
+        # Older Streamlit without column_config: pre-format as strings
+        display_df = df.copy()
+        for col in currency_cols:
+            display_df[col] = df[col].round().astype('int64').map('₹{:,}'.format)
+        st.dataframe(display_df, use_container_width=True)
+
+def dataframe_to_csv_bytes(df):
+    """Encode a DataFrame as UTF-8 CSV bytes using Arrow's native CSV writer"""
+    buffer = pa.BufferOutputStream()
+    pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), buffer)
+    return buffer.getvalue().to_pybytes()
+
+def downsample_lttb(x, y, target=200):
+    """
+    Reduce a line series to at most target points for plotting
+    Uses Largest-Triangle-Three-Buckets: keeps the first and last points and,
+    from each bucket in between, the point forming the largest triangle with
+    the previously kept point and the average of the next bucket
+    """
+    n = len(x)
+    if n <= target or target < 3:
+        return x, y
+
+    edges = np.linspace(1, n - 1, target - 1).astype(np.int64)
+    keep = np.empty(target, dtype=np.int64)
+    keep[0] = 0
+    keep[-1] = n - 1
+
+    prev = 0
+    for i in range(target - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x = x[hi:edges[i + 2]].mean()
+            next_y = y[hi:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+
+        area = np.abs((x[prev] - next_x) * (y[lo:hi] - y[prev]) - (x[prev] - x[lo:hi]) * (next_y - y[prev]))
+        prev = lo + int(np.argmax(area))
+        keep[i + 1] = prev
+
+    return x[keep], y[keep]
+
+def schedule_frame(schedule, columns):
+    """
+    Build a month-by-month DataFrame from an (N, 4) block of values
+    The single float64 block becomes one pandas block; Month and Year are prepended
+    """
+    months = np.arange(1, len(schedule) + 1)
+    df = pd.DataFrame(schedule, columns=columns)
+    df.insert(0, 'Year', (months - 1) // 12 + 1)
+    df.insert(0, 'Month', months)
+    return df
+
+@st.cache_data(max_entries=32, ttl=3600)
 def corpus_to_monthly_withdrawal(starting_corpus, annual_return, annual_inflation, years):
     """
     Calculate sustainable monthly withdrawal from corpus (inflation-adjusted)
@@ -62,6 +138,8 @@ def corpus_to_monthly_withdrawal(starting_corpus, annual_return, annual_inflatio
     monthly_return = convert_annual_to_monthly_rate(annual_return)
     monthly_inflation = convert_annual_to_monthly_rate(annual_inflation)
     total_months = years * 12
+    one_plus_r = 1.0 + monthly_return
+    one_plus_g = 1.0 + monthly_inflation
     
     # Real return rate (adjusted for inflation)
     if monthly_return == monthly_inflation:
@@ -70,83 +148,108 @@ def corpus_to_monthly_withdrawal(starting_corpus, annual_return, annual_inflatio
     else:
         # Growing annuity formula for inflation-adjusted withdrawals
         denominator = monthly_return - monthly_inflation
-        numerator = 1 - ((1 + monthly_inflation) / (1 + monthly_return)) ** total_months
+        numerator = 1 - (one_plus_g / one_plus_r) ** total_months
         pv_factor = numerator / denominator
         monthly_withdrawal = starting_corpus / pv_factor
     
-    # Generate month-by-month breakdown
-    data = []
-    current_corpus = starting_corpus
-    current_withdrawal = monthly_withdrawal
-    
-    for month in range(1, total_months + 1):
-        # Apply return to corpus
-        current_corpus = current_corpus * (1 + monthly_return)
-        
-        # Subtract current month's withdrawal
-        current_corpus -= current_withdrawal
-        
-        data.append({
-            'Month': month,
-            'Year': math.ceil(month / 12),
-            'Starting Balance': current_corpus + current_withdrawal,
-            'Monthly Return': (current_corpus + current_withdrawal) * monthly_return,
-            'Withdrawal Amount': current_withdrawal,
-            'Ending Balance': current_corpus
-        })
-        
-        # Increase withdrawal for next month due to inflation
-        current_withdrawal *= (1 + monthly_inflation)
-    
-    return pd.DataFrame(data), monthly_withdrawal
+    # Generate month-by-month breakdown in closed form:
+    # withdrawal grows as W * (1+g)^(k-1), corpus after k months is
+    # C * (1+r)^k - W * ((1+r)^k - (1+g)^k) / (r - g)
+    months = np.arange(1, total_months + 1)
+    pow_r = np.power(one_plus_r, months)
+    withdrawals = monthly_withdrawal * np.power(one_plus_g, months - 1)
 
-def withdrawal_to_corpus_duration(starting_corpus, monthly_withdrawal, annual_return, annual_inflation):
+    if monthly_return == monthly_inflation:
+        # Limit of the formula above when r == g
+        ending = starting_corpus * pow_r - monthly_withdrawal * months * pow_r / one_plus_r
+    else:
+        pow_g = np.power(one_plus_g, months)
+        if total_months >= NUMEXPR_MIN_ROWS:
+            ending = pd.eval(
+                "C0 * pr - W0 * (pr - pg) / (r - gi)",
+                local_dict={'C0': starting_corpus, 'W0': monthly_withdrawal, 'pr': pow_r, 'pg': pow_g,
+                            'r': monthly_return, 'gi': monthly_inflation}
+            )
+        else:
+            ending = starting_corpus * pow_r - monthly_withdrawal * (pow_r - pow_g) / (monthly_return - monthly_inflation)
+
+    schedule = np.empty((total_months, 4))
+    # Each month starts from the previous month's ending balance
+    schedule[:1, 0] = starting_corpus
+    schedule[1:, 0] = ending[:-1]
+    schedule[:, 1] = schedule[:, 0] * monthly_return
+    schedule[:, 2] = withdrawals
+    schedule[:, 3] = ending
+
+    return schedule_frame(schedule, ['Starting Balance', 'Monthly Return', 'Withdrawal Amount', 'Ending Balance']), monthly_withdrawal
+
+@njit(cache=True, fastmath=True)
+def simulate_depletion(starting_corpus, monthly_withdrawal, monthly_return, monthly_inflation, max_months=1200):
     """
-    Calculate how long corpus will last with given monthly withdrawals
-    Simulates month-by-month until corpus is depleted
+    Month-by-month depletion recurrence used by withdrawal_to_corpus_duration
+    Returns one row per month of starting balance, monthly return, withdrawal and ending balance
     """
-    monthly_return = convert_annual_to_monthly_rate(annual_return)
-    monthly_inflation = convert_annual_to_monthly_rate(annual_inflation)
-    
-    data = []
+    schedule = np.empty((max_months + 1, 4))
+
+    one_plus_g = 1.0 + monthly_inflation
     current_corpus = starting_corpus
     current_withdrawal = monthly_withdrawal
     month = 0
-    
+
     while current_corpus > 0:
-        month += 1
-        
+        schedule[month, 0] = current_corpus
+
         # Apply return to corpus
-        corpus_after_return = current_corpus * (1 + monthly_return)
-        
+        monthly_ret = current_corpus * monthly_return
+        corpus_after_return = current_corpus + monthly_ret
+
         # Check if withdrawal exceeds remaining corpus
         actual_withdrawal = min(current_withdrawal, corpus_after_return)
-        
+
         # Subtract withdrawal
         current_corpus = corpus_after_return - actual_withdrawal
-        
-        data.append({
-            'Month': month,
-            'Year': math.ceil(month / 12),
-            'Starting Balance': corpus_after_return,
-            'Monthly Return': current_corpus + actual_withdrawal - corpus_after_return + (corpus_after_return * monthly_return),
-            'Withdrawal Amount': actual_withdrawal,
-            'Ending Balance': max(0, current_corpus)
-        })
-        
+
+        schedule[month, 1] = monthly_ret
+        schedule[month, 2] = actual_withdrawal
+        schedule[month, 3] = max(0.0, current_corpus)
+        month += 1
+
         # If corpus is depleted, break
         if current_corpus <= 0:
             break
-            
+
         # Increase withdrawal for next month due to inflation
-        current_withdrawal *= (1 + monthly_inflation)
-        
+        current_withdrawal *= one_plus_g
+
         # Safety check to prevent infinite loop
-        if month > 1200:  # 100 years max
+        if month > max_months:
             break
-    
-    return pd.DataFrame(data), month
 
+    return schedule[:month]
+
+try:
+    # Prefer the compiled Cython loop when built (python setup.py build_ext --inplace)
+    from _finrecur import simulate_depletion
+except ImportError:
+    pass
+
+@st.cache_data(max_entries=32, ttl=3600)
+def withdrawal_to_corpus_duration(starting_corpus, monthly_withdrawal, annual_return, annual_inflation):
+    """
+    Calculate how long corpus will last with given monthly withdrawals
+    Simulates month-by-month until corpus is depleted
+    """
+    monthly_return = convert_annual_to_monthly_rate(annual_return)
+    monthly_inflation = convert_annual_to_monthly_rate(annual_inflation)
+
+    # 100 years max
+    schedule = simulate_depletion(
+        float(starting_corpus), float(monthly_withdrawal), monthly_return, monthly_inflation, 1200
+    )
+
+    return schedule_frame(schedule, ['Starting Balance', 'Monthly Return', 'Withdrawal Amount', 'Ending Balance']), len(schedule)
+
+@st.cache_data(max_entries=32, ttl=3600)
 def monthly_savings_to_corpus(monthly_sip, annual_stepup, years_to_retirement, annual_return):
     """
     Calculate final corpus from monthly SIP with annual step-up
@@ -155,65 +258,57 @@ def monthly_savings_to_corpus(monthly_sip, annual_stepup, years_to_retirement, a
     Where: PMT = Payment, r = return rate, g = growth rate, n = periods
     """
     monthly_return = convert_annual_to_monthly_rate(annual_return)
-    monthly_stepup = convert_annual_to_monthly_rate(annual_stepup)
     total_months = years_to_retirement * 12
-    
-    data = []
-    current_corpus = 0
-    current_sip = monthly_sip
-    
-    for month in range(1, total_months + 1):
-        # Add current month's SIP
-        current_corpus += current_sip
-        
-        # Apply return to corpus
-        current_corpus *= (1 + monthly_return)
-        
-        data.append({
-            'Month': month,
-            'Year': math.ceil(month / 12),
-            'SIP Amount': current_sip,
-            'Corpus Before Return': current_corpus - (current_corpus * monthly_return / (1 + monthly_return)),
-            'Monthly Return': current_corpus * monthly_return / (1 + monthly_return),
-            'Corpus After Return': current_corpus
-        })
-        
-        # Increase SIP annually (every 12 months)
-        if month % 12 == 0:
-            current_sip *= (1 + annual_stepup / 100)
-    
-    return pd.DataFrame(data), current_corpus
+    one_plus_r = 1.0 + monthly_return
+
+    # SIP steps up once every 12 months
+    months = np.arange(1, total_months + 1)
+    sip = monthly_sip * np.power(1 + annual_stepup / 100, (months - 1) // 12)
+
+    # C_m = (C_(m-1) + SIP_m) * (1+r) unrolls to
+    # C_m = (1+r)^(m+1) * sum(SIP_k / (1+r)^k for k <= m)
+    pow_r = np.power(one_plus_r, months)
+    if total_months >= NUMEXPR_MIN_ROWS:
+        discounted = pd.eval("sip / pr", local_dict={'sip': sip, 'pr': pow_r})
+        corpus = pd.eval("cs * pr * g", local_dict={'cs': np.cumsum(discounted), 'pr': pow_r, 'g': one_plus_r})
+    else:
+        corpus = np.cumsum(sip / pow_r) * pow_r * one_plus_r
+    final_corpus = corpus[-1] if total_months > 0 else 0
+
+    schedule = np.empty((total_months, 4))
+    schedule[:, 0] = sip
+    schedule[:, 2] = corpus * monthly_return / one_plus_r
+    schedule[:, 1] = corpus - schedule[:, 2]
+    schedule[:, 3] = corpus
+
+    return schedule_frame(schedule, ['SIP Amount', 'Corpus Before Return', 'Monthly Return', 'Corpus After Return']), final_corpus
 
-def custom_cashflow_calculation(cashflow_df, annual_return):
+@st.cache_data(max_entries=32, ttl=3600)
+def custom_cashflow_calculation(cashflows, annual_return):
     """
     Calculate PV/FV for custom monthly cashflow schedule
+    Takes one cashflow per month as an array
     Positive values are inflows, negative values are outflows
     """
     monthly_return = convert_annual_to_monthly_rate(annual_return)
+    one_plus_r = 1.0 + monthly_return
     
-    data = []
-    current_corpus = 0
-    
-    for index, row in cashflow_df.iterrows():
-        month = index + 1
-        cashflow = row['Cashflow']
-        
-        # Apply return to existing corpus
-        current_corpus *= (1 + monthly_return)
-        
-        # Add/subtract cashflow
-        current_corpus += cashflow
-        
-        data.append({
-            'Month': month,
-            'Year': math.ceil(month / 12),
-            'Cashflow': cashflow,
-            'Corpus Before Cashflow': current_corpus - cashflow,
-            'Monthly Return': (current_corpus - cashflow) * monthly_return,
-            'Corpus After Cashflow': current_corpus
-        })
-    
-    return pd.DataFrame(data), current_corpus
+    cashflows = np.asarray(cashflows, dtype=np.float64)
+    months = np.arange(1, len(cashflows) + 1)
+
+    # C_n = C_(n-1) * (1+r) + CF_n unrolls to
+    # C_n = (1+r)^n * sum(CF_k / (1+r)^k for k <= n)
+    growth = np.power(one_plus_r, months)
+    corpus = growth * np.cumsum(cashflows / growth)
+    final_corpus = corpus[-1] if len(corpus) > 0 else 0
+
+    schedule = np.empty((len(cashflows), 4))
+    schedule[:, 0] = cashflows
+    schedule[:, 1] = corpus - cashflows
+    schedule[:, 2] = schedule[:, 1] * monthly_return
+    schedule[:, 3] = corpus
+
+    return schedule_frame(schedule, ['Cashflow', 'Corpus Before Cashflow', 'Monthly Return', 'Corpus After Cashflow']), final_corpus
 
 def main():
     # Main header
@@ -239,16 +334,18 @@ def main():
         st.markdown('<h2 class="scenario-header">📈 Corpus to Monthly Withdrawal Calculator</h2>', unsafe_allow_html=True)
         st.write("Calculate sustainable monthly withdrawal amount from your retirement corpus (inflation-adjusted).")
         
-        # Input fields
-        col1, col2 = st.sidebar.columns(2)
-        with col1:
-            starting_corpus = st.number_input("Starting Corpus (₹)", value=10000000, step=100000, format="%d")
-            annual_return = st.number_input("Annual Return (%)", value=8.0, step=0.1, format="%.1f")
-        with col2:
-            annual_inflation = st.number_input("Annual Inflation (%)", value=6.0, step=0.1, format="%.1f")
-            years = st.number_input("Number of Years", value=25, step=1, format="%d")
+        # Input fields, batched into a form so edits only rerun on submit
+        with st.sidebar.form(f"form_{scenario}", clear_on_submit=False):
+            col1, col2 = st.columns(2)
+            with col1:
+                starting_corpus = st.number_input("Starting Corpus (₹)", value=10000000, step=100000, format="%d")
+                annual_return = st.number_input("Annual Return (%)", value=8.0, step=0.1, format="%.1f")
+            with col2:
+                annual_inflation = st.number_input("Annual Inflation (%)", value=6.0, step=0.1, format="%.1f")
+                years = st.number_input("Number of Years", value=25, step=1, format="%d")
+            submitted = st.form_submit_button("Calculate", type="primary")
         
-        if st.sidebar.button("Calculate", type="primary"):
+        if submitted:
             df, monthly_withdrawal = corpus_to_monthly_withdrawal(starting_corpus, annual_return, annual_inflation, years)
             
             # Results summary
@@ -263,25 +360,23 @@ def main():
                 st.metric("Total Amount Withdrawn", format_currency(total_withdrawn))
             
             # Chart
-            fig = px.line(df, x='Month', y='Ending Balance', 
-                         title='Corpus Depletion Over Time',
-                         labels={'Ending Balance': 'Corpus Balance (₹)', 'Month': 'Month'})
-            fig.update_layout(yaxis_tickformat='₹,.0f')
+            import plotly.graph_objects as go
+            months, balances = downsample_lttb(
+                df['Month'].to_numpy(dtype=np.int32), df['Ending Balance'].to_numpy(dtype=np.float32)
+            )
+            fig = go.Figure(go.Scattergl(x=months, y=balances, mode='lines', text=format_currency_vec(balances),
+                                         hovertemplate='Month %{x}<br>%{text}<extra></extra>'))
+            fig.update_layout(title='Corpus Depletion Over Time', xaxis_title='Month', yaxis_title='Corpus Balance (₹)',
+                              yaxis_tickformat='₹,.0f')
             st.plotly_chart(fig, use_container_width=True)
             
             # Data table and download
             st.subheader("Month-by-Month Breakdown")
             
-            # Format currency columns for display
-            display_df = df.copy()
-            currency_cols = ['Starting Balance', 'Monthly Return', 'Withdrawal Amount', 'Ending Balance']
-            for col in currency_cols:
-                display_df[col] = display_df[col].apply(lambda x: f"₹{x:,.0f}")
-            
-            st.dataframe(display_df, use_container_width=True)
+            show_currency_table(df, ['Starting Balance', 'Monthly Return', 'Withdrawal Amount', 'Ending Balance'])
             
             # CSV download
-            csv = df.to_csv(index=False)
+            csv = dataframe_to_csv_bytes(df)
             st.download_button(
                 label="📥 Download CSV",
                 data=csv,
@@ -293,16 +388,18 @@ def main():
         st.markdown('<h2 class="scenario-header">⏰ Withdrawal to Corpus Duration Calculator</h2>', unsafe_allow_html=True)
         st.write("Calculate how long your corpus will last with a given monthly withdrawal amount.")
         
-        # Input fields
-        col1, col2 = st.sidebar.columns(2)
-        with col1:
-            starting_corpus = st.number_input("Starting Corpus (₹)", value=10000000, step=100000, format="%d")
-            monthly_withdrawal = st.number_input("Monthly Withdrawal (₹)", value=80000, step=1000, format="%d")
-        with col2:
-            annual_return = st.number_input("Annual Return (%)", value=8.0, step=0.1, format="%.1f")
-            annual_inflation = st.number_input("Annual Inflation (%)", value=6.0, step=0.1, format="%.1f")
+        # Input fields, batched into a form so edits only rerun on submit
+        with st.sidebar.form(f"form_{scenario}", clear_on_submit=False):
+            col1, col2 = st.columns(2)
+            with col1:
+                starting_corpus = st.number_input("Starting Corpus (₹)", value=10000000, step=100000, format="%d")
+                monthly_withdrawal = st.number_input("Monthly Withdrawal (₹)", value=80000, step=1000, format="%d")
+            with col2:
+                annual_return = st.number_input("Annual Return (%)", value=8.0, step=0.1, format="%.1f")
+                annual_inflation = st.number_input("Annual Inflation (%)", value=6.0, step=0.1, format="%.1f")
+            submitted = st.form_submit_button("Calculate", type="primary")
         
-        if st.sidebar.button("Calculate", type="primary"):
+        if submitted:
             df, total_months = withdrawal_to_corpus_duration(starting_corpus, monthly_withdrawal, annual_return, annual_inflation)
             
             # Results summary
@@ -317,25 +414,23 @@ def main():
                 st.metric("Total Amount Withdrawn", format_currency(total_withdrawn))
             
             # Chart
-            fig = px.line(df, x='Month', y='Ending Balance', 
-                         title='Corpus Depletion Over Time',
-                         labels={'Ending Balance': 'Corpus Balance (₹)', 'Month': 'Month'})
-            fig.update_layout(yaxis_tickformat='₹,.0f')
+            import plotly.graph_objects as go
+            months, balances = downsample_lttb(
+                df['Month'].to_numpy(dtype=np.int32), df['Ending Balance'].to_numpy(dtype=np.float32)
+            )
+            fig = go.Figure(go.Scattergl(x=months, y=balances, mode='lines', text=format_currency_vec(balances),
+                                         hovertemplate='Month %{x}<br>%{text}<extra></extra>'))
+            fig.update_layout(title='Corpus Depletion Over Time', xaxis_title='Month', yaxis_title='Corpus Balance (₹)',
+                              yaxis_tickformat='₹,.0f')
             st.plotly_chart(fig, use_container_width=True)
             
             # Data table and download
             st.subheader("Month-by-Month Breakdown")
             
-            # Format currency columns for display
-            display_df = df.copy()
-            currency_cols = ['Starting Balance', 'Monthly Return', 'Withdrawal Amount', 'Ending Balance']
-            for col in currency_cols:
-                display_df[col] = display_df[col].apply(lambda x: f"₹{x:,.0f}")
-            
-            st.dataframe(display_df, use_container_width=True)
+            show_currency_table(df, ['Starting Balance', 'Monthly Return', 'Withdrawal Amount', 'Ending Balance'])
             
             # CSV download
-            csv = df.to_csv(index=False)
+            csv = dataframe_to_csv_bytes(df)
             st.download_button(
                 label="📥 Download CSV",
                 data=csv,
@@ -347,16 +442,18 @@ def main():
         st.markdown('<h2 class="scenario-header">💪 Monthly Savings to Corpus Calculator</h2>', unsafe_allow_html=True)
         st.write("Calculate final retirement corpus from monthly SIP with annual step-up.")
         
-        # Input fields
-        col1, col2 = st.sidebar.columns(2)
-        with col1:
-            monthly_sip = st.number_input("Monthly SIP Amount (₹)", value=50000, step=1000, format="%d")
-            annual_stepup = st.number_input("Annual Step-up (%)", value=10.0, step=0.1, format="%.1f")
-        with col2:
-            years_to_retirement = st.number_input("Years to Retirement", value=20, step=1, format="%d")
-            annual_return = st.number_input("Annual Return (%)", value=12.0, step=0.1, format="%.1f")
+        # Input fields, batched into a form so edits only rerun on submit
+        with st.sidebar.form(f"form_{scenario}", clear_on_submit=False):
+            col1, col2 = st.columns(2)
+            with col1:
+                monthly_sip = st.number_input("Monthly SIP Amount (₹)", value=50000, step=1000, format="%d")
+                annual_stepup = st.number_input("Annual Step-up (%)", value=10.0, step=0.1, format="%.1f")
+            with col2:
+                years_to_retirement = st.number_input("Years to Retirement", value=20, step=1, format="%d")
+                annual_return = st.number_input("Annual Return (%)", value=12.0, step=0.1, format="%.1f")
+            submitted = st.form_submit_button("Calculate", type="primary")
         
-        if st.sidebar.button("Calculate", type="primary"):
+        if submitted:
             df, final_corpus = monthly_savings_to_corpus(monthly_sip, annual_stepup, years_to_retirement, annual_return)
             
             # Results summary
@@ -372,25 +469,23 @@ def main():
                 st.metric("Returns Earned", format_currency(returns_earned))
             
             # Chart
-            fig = px.line(df, x='Month', y='Corpus After Return', 
-                         title='Corpus Growth Over Time',
-                         labels={'Corpus After Return': 'Corpus Value (₹)', 'Month': 'Month'})
-            fig.update_layout(yaxis_tickformat='₹,.0f')
+            import plotly.graph_objects as go
+            months, balances = downsample_lttb(
+                df['Month'].to_numpy(dtype=np.int32), df['Corpus After Return'].to_numpy(dtype=np.float32)
+            )
+            fig = go.Figure(go.Scattergl(x=months, y=balances, mode='lines', text=format_currency_vec(balances),
+                                         hovertemplate='Month %{x}<br>%{text}<extra></extra>'))
+            fig.update_layout(title='Corpus Growth Over Time', xaxis_title='Month', yaxis_title='Corpus Value (₹)',
+                              yaxis_tickformat='₹,.0f')
             st.plotly_chart(fig, use_container_width=True)
             
             # Data table and download
             st.subheader("Month-by-Month Breakdown")
             
-            # Format currency columns for display
-            display_df = df.copy()
-            currency_cols = ['SIP Amount', 'Corpus Before Return', 'Monthly Return', 'Corpus After Return']
-            for col in currency_cols:
-                display_df[col] = display_df[col].apply(lambda x: f"₹{x:,.0f}")
-            
-            st.dataframe(display_df, use_container_width=True)
+            show_currency_table(df, ['SIP Amount', 'Corpus Before Return', 'Monthly Return', 'Corpus After Return'])
             
             # CSV download
-            csv = df.to_csv(index=False)
+            csv = dataframe_to_csv_bytes(df)
             st.download_button(
                 label="📥 Download CSV",
                 data=csv,
@@ -402,30 +497,48 @@ def main():
         st.markdown('<h2 class="scenario-header">📋 Custom Cashflow Analysis</h2>', unsafe_allow_html=True)
         st.write("Upload a custom monthly cashflow schedule and calculate PV/FV. Positive values are inflows, negative values are outflows.")
         
-        # Input fields
-        annual_return = st.sidebar.number_input("Annual Return (%)", value=8.0, step=0.1, format="%.1f")
+        # Input fields, batched into a form so edits only rerun on submit
+        form = st.sidebar.form(f"form_{scenario}", clear_on_submit=False)
         
-        # File upload
+        # File upload stays outside the form so the file is seen (and validated) as soon as it is picked
         uploaded_file = st.sidebar.file_uploader("Upload CSV file", type=['csv'])
         
+        with form:
+            annual_return = st.number_input("Annual Return (%)", value=8.0, step=0.1, format="%.1f")
+            
+            submitted = use_sample = False
+            if uploaded_file is not None:
+                submitted = st.form_submit_button("Calculate", type="primary")
+            else:
+                # Show sample data option
+                use_sample = st.form_submit_button("Use Sample Data")
+        
         # Sample CSV format
         st.sidebar.markdown("### CSV Format:")
         st.sidebar.code("Cashflow\n50000\n-30000\n25000\n...")
         
         if uploaded_file is not None:
             try:
-                # Read uploaded CSV
-                cashflow_df = pd.read_csv(uploaded_file)
+                # Read uploaded CSV: a header row, then plain numeric rows
+                # (splitlines accepts \n, \r\n and bare \r line endings)
+                lines = uploaded_file.getvalue().decode('utf-8-sig').splitlines()
+                columns = [col.strip() for col in next(csv.reader(lines[:1]), [])]
+                rows = [line for line in lines[1:] if line.strip()]
                 
-                if 'Cashflow' not in cashflow_df.columns:
+                if 'Cashflow' not in columns:
                     st.error("CSV must have a 'Cashflow' column")
+                elif not rows:
+                    st.error("CSV has no cashflow rows")
                 else:
-                    if st.sidebar.button("Calculate", type="primary"):
-                        df, final_value = custom_cashflow_calculation(cashflow_df, annual_return)
+                    cashflows = np.loadtxt(rows, delimiter=',', quotechar='"', comments=None,
+                                           usecols=columns.index('Cashflow'), ndmin=1)
+                    
+                    if submitted:
+                        df, final_value = custom_cashflow_calculation(cashflows, annual_return)
                         
                         # Results summary
-                        total_inflows = cashflow_df[cashflow_df['Cashflow'] > 0]['Cashflow'].sum()
-                        total_outflows = abs(cashflow_df[cashflow_df['Cashflow'] < 0]['Cashflow'].sum())
+                        total_inflows = cashflows[cashflows > 0].sum()
+                        total_outflows = abs(cashflows[cashflows < 0].sum())
                         net_cashflow = total_inflows - total_outflows
                         
                         col1, col2, col3, col4 = st.columns(4)
@@ -439,25 +552,23 @@ def main():
                             st.metric("Net Cashflow", format_currency(net_cashflow))
                         
                         # Chart
-                        fig = px.line(df, x='Month', y='Corpus After Cashflow', 
-                                     title='Corpus Value Over Time',
-                                     labels={'Corpus After Cashflow': 'Corpus Value (₹)', 'Month': 'Month'})
-                        fig.update_layout(yaxis_tickformat='₹,.0f')
+                        import plotly.graph_objects as go
+                        months, balances = downsample_lttb(
+                            df['Month'].to_numpy(dtype=np.int32), df['Corpus After Cashflow'].to_numpy(dtype=np.float32)
+                        )
+                        fig = go.Figure(go.Scattergl(x=months, y=balances, mode='lines', text=format_currency_vec(balances),
+                                                     hovertemplate='Month %{x}<br>%{text}<extra></extra>'))
+                        fig.update_layout(title='Corpus Value Over Time', xaxis_title='Month', yaxis_title='Corpus Value (₹)',
+                                          yaxis_tickformat='₹,.0f')
                         st.plotly_chart(fig, use_container_width=True)
                         
                         # Data table and download
                         st.subheader("Month-by-Month Breakdown")
                         
-                        # Format currency columns for display
-                        display_df = df.copy()
-                        currency_cols = ['Cashflow', 'Corpus Before Cashflow', 'Monthly Return', 'Corpus After Cashflow']
-                        for col in currency_cols:
-                            display_df[col] = display_df[col].apply(lambda x: f"₹{x:,.0f}")
-                        
-                        st.dataframe(display_df, use_container_width=True)
+                        show_currency_table(df, ['Cashflow', 'Corpus Before Cashflow', 'Monthly Return', 'Corpus After Cashflow'])
                         
                         # CSV download
-                        csv = df.to_csv(index=False)
+                        csv = dataframe_to_csv_bytes(df)
                         st.download_button(
                             label="📥 Download CSV",
                             data=csv,
@@ -469,17 +580,17 @@ def main():
                 st.error(f"Error reading CSV file: {str(e)}")
         
         else:
-            # Show sample data option
-            if st.sidebar.button("Use Sample Data"):
-                sample_data = pd.DataFrame({
-                    'Cashflow': [50000, 52000, 54000, -30000, -31000, 60000, 62000, -35000, 65000, 67000, -40000, 70000]
-                })
+            if use_sample:
+                sample_cashflows = np.array(
+                    [50000, 52000, 54000, -30000, -31000, 60000, 62000, -35000, 65000, 67000, -40000, 70000],
+                    dtype=np.float64
+                )
                 
-                df, final_value = custom_cashflow_calculation(sample_data, annual_return)
+                df, final_value = custom_cashflow_calculation(sample_cashflows, annual_return)
                 
                 # Results summary
-                total_inflows = sample_data[sample_data['Cashflow'] > 0]['Cashflow'].sum()
-                total_outflows = abs(sample_data[sample_data['Cashflow'] < 0]['Cashflow'].sum())
+                total_inflows = sample_cashflows[sample_cashflows > 0].sum()
+                total_outflows = abs(sample_cashflows[sample_cashflows < 0].sum())
                 net_cashflow = total_inflows - total_outflows
                 
                 col1, col2, col3, col4 = st.columns(4)
@@ -493,10 +604,14 @@ def main():
                     st.metric("Net Cashflow", format_currency(net_cashflow))
                 
                 # Chart
-                fig = px.line(df, x='Month', y='Corpus After Cashflow', 
-                             title='Corpus Value Over Time (Sample Data)',
-                             labels={'Corpus After Cashflow': 'Corpus Value (₹)', 'Month': 'Month'})
-                fig.update_layout(yaxis_tickformat='₹,.0f')
+                import plotly.graph_objects as go
+                months, balances = downsample_lttb(
+                    df['Month'].to_numpy(dtype=np.int32), df['Corpus After Cashflow'].to_numpy(dtype=np.float32)
+                )
+                fig = go.Figure(go.Scattergl(x=months, y=balances, mode='lines', text=format_currency_vec(balances),
+                                             hovertemplate='Month %{x}<br>%{text}<extra></extra>'))
+                fig.update_layout(title='Corpus Value Over Time (Sample Data)', xaxis_title='Month', yaxis_title='Corpus Value (₹)',
+                                  yaxis_tickformat='₹,.0f')
                 st.plotly_chart(fig, use_container_width=True)
     
     # Footer
@@ -0,0 +1,9 @@
+# Builds the optional native depletion loop used by app.py:
+#     python setup.py build_ext --inplace
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="retirement-planner",
+    ext_modules=cythonize("_finrecur.pyx"),
+)